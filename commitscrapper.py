@@ -14,11 +14,13 @@ import logging
 from datetime import datetime, timedelta
 import threading
 
-# Increase CSV field size limit for large README content
-csv.field_size_limit(1000000)
+# Increase CSV field size limit for large README content (never lowers a higher limit)
+if csv.field_size_limit() < 1000000:
+    csv.field_size_limit(1000000)
 from typing import List, Dict, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
+from operator import attrgetter, itemgetter
 from dataclasses import dataclass, asdict
 import requests
 from dotenv import load_dotenv
@@ -191,14 +193,8 @@ class TokenManager:
     
     def _is_token_available(self, token: str) -> bool:
         """Check if a token has available rate limit"""
-        stats = self.token_stats[token]
-        
-        # If rate limit is reset or never set, token is available
-        if stats["reset_time"] is None or datetime.now() >= stats["reset_time"]:
-            return stats["remaining"] > 10
-        
-        # If reset time hasn't passed, check remaining
-        return stats["remaining"] > 10
+        # remaining is refreshed by update_rate_limit/sleep_and_reset, so no clock read is needed
+        return self.token_stats[token]["remaining"] > 10
     
     def get_token(self) -> str:
         """Get next available token with rate limit check and dynamic borrowing"""
@@ -246,15 +242,9 @@ class TokenManager:
     def get_stats(self) -> Dict:
         """Get current token statistics"""
         with self.lock:
-            total_requests = sum(stats["requests"] for stats in self.token_stats.values())
-            available_tokens = sum(
-                1 for token in self.tokens
-                if self._is_token_available(token)
-            )
-            exhausted_tokens = sum(
-                1 for token in self.tokens
-                if not self._is_token_available(token)
-            )
+            total_requests = sum(map(itemgetter("requests"), self.token_stats.values()))
+            available_tokens = sum(map(self._is_token_available, self.tokens))
+            exhausted_tokens = len(self.tokens) - available_tokens
             
             return {
                 "total_tokens": len(self.tokens),
@@ -295,7 +285,9 @@ class TokenManager:
             # We're the chosen thread to handle the sleep
             self.sleep_in_progress = True
             logger.warning(f"⚠️ All {len(self.tokens)} tokens exhausted! Sleeping for {RATE_LIMIT_SLEEP}s (1 hour)...")
-            stats = self.get_stats()
+        
+        # get_stats takes the (non-reentrant) lock itself
+        stats = self.get_stats()
         
         # Send notification (outside lock to avoid blocking)
         try:
@@ -886,9 +878,10 @@ def generate_final_report(
     # Sort emojis by frequency
     top_emojis = sorted(emoji_counts.items(), key=lambda x: x[1], reverse=True)[:10]
     
-    # Calculate affiliation statistics
+    # Calculate affiliation and PR statistics
     deepseek_count = sum(1 for r in results if r.deepseek_affiliation.lower() != 'none')
     chatgpt_count = sum(1 for r in results if r.chatgpt_affiliation.lower() != 'none')
+    pr_count = sum(map(attrgetter('is_pull_request'), results))
     
     # Build report
     report = f"""
@@ -914,7 +907,7 @@ EMOJI COMMIT FINDINGS
 ---------------------
 Total Emoji Commits: {len(results):,}
 Unique Repositories: {len(set(f"{r.repo_owner}/{r.repo_name}" for r in results)):,}
-From Pull Requests:  {sum(1 for r in results if r.is_pull_request):,} ({sum(1 for r in results if r.is_pull_request)/len(results)*100:.1f}% if results else 0)
+From Pull Requests:  {pr_count:,} ({pr_count/len(results)*100:.1f}% if results else 0)
 
 Top 10 Most Used Emojis:
 """
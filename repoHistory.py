@@ -6,18 +6,34 @@ Supports daily and weekly tracking with comprehensive reporting
 """
 
 import os
+import re
 import csv
 import time
+import heapq
 import logging
 import requests
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, ClassVar, Iterable, Iterator, List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from threading import Lock
-from dataclasses import dataclass, asdict
+from operator import attrgetter
+from itertools import chain, islice
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 import traceback
 
+try:
+    import orjson  # Faster JSON encoding/decoding for API pages and webhooks
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa  # Optional columnar (Parquet) snapshot export
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 # Load environment variables
 load_dotenv()
 
@@ -29,6 +45,7 @@ load_dotenv()
 REQUEST_DELAY = 0.1  # 100ms delay between requests
 RATE_LIMIT_SLEEP = 3600  # 1 hour sleep when all tokens exhausted
 MAX_WORKERS = 12  # Maximum concurrent workers
+TASKS_PER_WORKER = 4  # Repositories queued per worker at a time (bounds pending futures)
 
 # Filter Configuration
 # Set to True to only scrape repos with affiliation (deepseek or chatgpt)
@@ -54,13 +71,18 @@ WEEKS_TO_TRACK = 200  # Number of weeks to track (1 year = 52)
 
 # Growth Analysis
 CALCULATE_GROWTH = True  # Calculate week-by-week growth from historical data
-TEMP_SNAPSHOT_CSV = r"results/.temp_repo_snapshots.csv"  # Temporary snapshots storage
+CSV_READ_BUFFER = 1 << 20  # 1 MB read buffer for CSV ingest
+
+# Columnar Export
+# Also write this run's snapshots to a zstd-compressed Parquet file (requires pyarrow)
+SAVE_PARQUET = True
+SNAPSHOT_PARQUET = f"results/repo_snapshots_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
 
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StarHistoryRecord:
     """Record of repository history for a repository"""
     repo_owner: str
@@ -75,8 +97,15 @@ class StarHistoryRecord:
     total_issues: int  # Total issues count
     deepseek_affiliation: str
     chatgpt_affiliation: str
+    # Derived flags, computed once at construction for report aggregation
+    has_deepseek_affiliation: bool = field(init=False, repr=False, compare=False)
+    has_chatgpt_affiliation: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'has_deepseek_affiliation', self.deepseek_affiliation.lower() != 'none')
+        object.__setattr__(self, 'has_chatgpt_affiliation', self.chatgpt_affiliation.lower() != 'none')
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GrowthRecord:
     """Week-by-week growth analysis for a repository"""
     repo_owner: str
@@ -105,6 +134,75 @@ class GrowthRecord:
     deepseek_affiliation: str
     chatgpt_affiliation: str
 
+@dataclass(slots=True)
+class GrowthSummary:
+    """Totals and top growth periods, accumulated while growth records are written"""
+    TOP_N: ClassVar[int] = 10
+    
+    period_count: int = 0
+    tracked_repos: set = field(default_factory=set)
+    total_stars_gained: int = 0
+    total_forks_gained: int = 0
+    total_contributors_gained: int = 0
+    total_prs_created: int = 0
+    total_commits_added: int = 0
+    total_issues_created: int = 0
+    # Bounded min-heaps of (value, -sequence, record); ties keep the earliest record
+    top_stars: list = field(default_factory=list)
+    top_commits: list = field(default_factory=list)
+    top_prs: list = field(default_factory=list)
+    top_issues: list = field(default_factory=list)
+    
+    def add(self, r: GrowthRecord):
+        """Fold one growth record into the running totals and top-N heaps"""
+        seq = -self.period_count
+        self.period_count += 1
+        self.tracked_repos.add((r.repo_owner, r.repo_name))
+        self.total_stars_gained += r.stars_gained
+        self.total_forks_gained += r.forks_gained
+        self.total_contributors_gained += r.contributors_gained
+        self.total_prs_created += r.prs_created
+        self.total_commits_added += r.commits_added
+        self.total_issues_created += r.issues_created
+        
+        for heap, value in (
+            (self.top_stars, r.stars_gained),
+            (self.top_commits, r.commits_added),
+            (self.top_prs, r.prs_created),
+            (self.top_issues, r.issues_created),
+        ):
+            if len(heap) < self.TOP_N:
+                heapq.heappush(heap, (value, seq, r))
+            else:
+                heapq.heappushpop(heap, (value, seq, r))
+    
+    @staticmethod
+    def ranked(heap: list) -> List[GrowthRecord]:
+        """Records of a top-N heap, largest first (same order as heapq.nlargest)"""
+        return [entry[2] for entry in sorted(heap, reverse=True)]
+
+SNAPSHOT_FIELDS = (
+    'repo_owner', 'repo_name', 'repo_url', 'snapshot_date',
+    'total_stars', 'total_forks', 'total_contributors',
+    'total_prs', 'total_commits', 'total_issues',
+    'deepseek_affiliation', 'chatgpt_affiliation'
+)
+
+GROWTH_FIELDS = (
+    'repo_owner', 'repo_name', 'repo_url',
+    'week_start_date', 'week_end_date',
+    'stars_start', 'stars_end', 'stars_gained',
+    'forks_start', 'forks_end', 'forks_gained',
+    'contributors_start', 'contributors_end', 'contributors_gained',
+    'prs_start', 'prs_end', 'prs_created',
+    'commits_start', 'commits_end', 'commits_added',
+    'issues_start', 'issues_end', 'issues_created',
+    'deepseek_affiliation', 'chatgpt_affiliation'
+)
+
+# Row extractor in CSV column order (single source of truth for the growth schema)
+_growth_row = attrgetter(*GROWTH_FIELDS)
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -164,11 +262,25 @@ class TokenManager:
         
         return tokens
     
+    def _is_token_available(self, token: str, now: datetime) -> bool:
+        """Check if a token has requests left or its rate limit window has reset"""
+        stats = self.token_stats[token]
+        return stats["remaining"] > 0 or stats["reset_time"] is None or now >= stats["reset_time"]
+    
     def get_token(self) -> str:
-        """Get next available token with rotation"""
+        """Get next available token with rotation, skipping exhausted tokens"""
         with self.lock:
-            token = self.tokens[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.tokens)
+            now = datetime.now()
+            for _ in range(len(self.tokens)):
+                token = self.tokens[self.current_index]
+                self.current_index = (self.current_index + 1) % len(self.tokens)
+                
+                if self._is_token_available(token, now):
+                    self.token_stats[token]["requests"] += 1
+                    return token
+            
+            # All tokens exhausted - fall back to the one that resets first
+            token = min(self.tokens, key=lambda t: self.token_stats[t]["reset_time"])
             self.token_stats[token]["requests"] += 1
             return token
     
@@ -181,6 +293,21 @@ class TokenManager:
             if remaining < 100:
                 logger.warning(f"⚠️ Token running low: {remaining} requests remaining")
     
+    def mark_exhausted(self, token: str, until: int):
+        """Mark a token as rate limited until the given reset timestamp"""
+        with self.lock:
+            self.token_stats[token]["remaining"] = 0
+            self.token_stats[token]["reset_time"] = datetime.fromtimestamp(until)
+    
+    def seconds_until_available(self) -> float:
+        """Seconds until at least one token can be used again (0 if one is available now)"""
+        with self.lock:
+            now = datetime.now()
+            if any(self._is_token_available(token, now) for token in self.tokens):
+                return 0
+            earliest_reset = min(stats["reset_time"] for stats in self.token_stats.values())
+            return max((earliest_reset - now).total_seconds(), 0) + 1
+    
     def get_stats(self) -> Dict:
         """Get current token statistics"""
         with self.lock:
@@ -204,6 +331,10 @@ class TokenManager:
 # GITHUB API CLIENT
 # ============================================================================
 
+# Pagination Link header parsing (last page number == total count with per_page=1)
+_LINK_LAST_TOKEN = 'rel="last"'
+_LAST_PAGE_RE = re.compile(r'page=(\d+)>; rel="last"')
+
 class GitHubClient:
     """GitHub API client for fetching repository data"""
     
@@ -211,16 +342,31 @@ class GitHubClient:
         self.token_manager = token_manager
         self.rest_base = "https://api.github.com"
         self.session = requests.Session()
+        # Transport errors, timeouts and 5xx responses are retried by urllib3 with
+        # exponential backoff on the pooled connection (honoring Retry-After)
+        retry = Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=MAX_WORKERS,
             pool_maxsize=MAX_WORKERS * 2,
-            max_retries=0
+            max_retries=retry
         )
         self.session.mount('https://', adapter)
         self.session.mount('http://', adapter)
     
-    def _make_request(self, url: str, headers: Dict = None) -> Optional[requests.Response]:
-        """Make HTTP request with token rotation"""
+    def _make_request(
+        self,
+        url: str,
+        headers: Dict = None,
+        accept: str = "application/vnd.github+json"
+    ) -> Optional[requests.Response]:
+        """Make HTTP request with token rotation (retries with a new token on 401/403/429)"""
         max_retries = 3
         retry_delays = [2, 5, 10]
         
@@ -229,7 +375,8 @@ class GitHubClient:
             request_headers = headers or {}
             request_headers.update({
                 "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github.star+json",  # Include star timestamps
+                "Accept": accept,
+                "Accept-Encoding": "gzip",
                 "X-GitHub-Api-Version": "2022-11-28"
             })
             
@@ -239,63 +386,86 @@ class GitHubClient:
                 logger.debug(f"🌐 Making request to {url[:80]}... (attempt {attempt + 1}/{max_retries})")
                 response = self.session.get(url, headers=request_headers, timeout=30)
                 logger.debug(f"✓ Response received: {response.status_code}")
-                
-                # Update rate limit info
-                if 'X-RateLimit-Remaining' in response.headers:
-                    remaining = int(response.headers['X-RateLimit-Remaining'])
-                    reset = int(response.headers['X-RateLimit-Reset'])
-                    self.token_manager.update_rate_limit(token, remaining, reset)
-                
-                # Handle different status codes
-                if response.status_code == 200:
-                    return response
-                elif response.status_code == 404:
-                    logger.warning(f"Repository not found: {url}")
-                    return None
-                elif response.status_code == 403:
-                    logger.warning(f"Rate limit or forbidden: {response.text[:200]}")
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delays[attempt])
-                        continue
-                elif response.status_code in [502, 503, 504]:
-                    logger.warning(f"Server error {response.status_code}, retrying...")
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delays[attempt])
-                        continue
-                
-                response.raise_for_status()
-                return response
-                
-            except requests.exceptions.Timeout:
-                logger.warning(f"⏱️ Request timeout (attempt {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
             except requests.exceptions.RequestException as e:
+                # The adapter has already retried connection errors and timeouts
                 logger.warning(f"Request failed: {str(e)[:100]}")
+                return None
+            
+            # Update rate limit info
+            if 'X-RateLimit-Remaining' in response.headers:
+                remaining = int(response.headers['X-RateLimit-Remaining'])
+                reset = int(response.headers['X-RateLimit-Reset'])
+                self.token_manager.update_rate_limit(token, remaining, reset)
+            
+            # Handle different status codes
+            if response.status_code == 200:
+                return response
+            elif response.status_code == 404:
+                logger.warning(f"Repository not found: {url}")
+                return None
+            elif response.status_code in (403, 429):
+                # GitHub signals rate limits with either status
+                logger.warning(f"Rate limit or forbidden: {response.text[:200]}")
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
+                    time.sleep(self._rate_limit_wait(response, token, retry_delays[attempt]))
+                continue
+            elif response.status_code == 401:
+                # Bad or revoked token: the next attempt rotates to another one
+                logger.warning(f"Token rejected (401), rotating to next token")
+                continue
+            elif not response.ok:
+                # Other 4xx are terminal; 5xx responses reaching here already
+                # exhausted the adapter's retries
+                logger.warning(f"HTTP {response.status_code} for {url}: {response.text[:100]}")
+                return None
+            
+            return response
         
         logger.error(f"❌ All {max_retries} retry attempts exhausted for {url}")
         return None
     
+    def _rate_limit_wait(self, response: requests.Response, token: str, default_delay: float) -> float:
+        """Seconds to wait before retrying a 403/429, based on GitHub's rate limit headers"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            # Secondary rate limit: GitHub tells us exactly how long to back off
+            return min(int(retry_after), RATE_LIMIT_SLEEP)
+        
+        reset = response.headers.get('X-RateLimit-Reset')
+        if response.headers.get('X-RateLimit-Remaining') == '0' and reset:
+            # Primary rate limit: park this token and only wait if no other token is usable
+            self.token_manager.mark_exhausted(token, int(reset))
+            wait = self.token_manager.seconds_until_available()
+            if wait:
+                logger.warning(f"⏳ All tokens rate limited, waiting {wait:.0f}s for reset")
+            return min(wait, RATE_LIMIT_SLEEP)
+        
+        return default_delay
+    
+    @staticmethod
+    def _parse(response: requests.Response) -> Any:
+        """Decode JSON response body (uses orjson when installed)"""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
     def get_repository_info(self, owner: str, repo: str) -> Optional[Dict]:
         """Get repository information including current star count"""
         url = f"{self.rest_base}/repos/{owner}/{repo}"
         response = self._make_request(url)
         
         if response:
-            return response.json()
+            return self._parse(response)
         return None
     
     def get_stargazers_page(self, owner: str, repo: str, page: int = 1, per_page: int = 100) -> Optional[List[Dict]]:
         """Get a page of stargazers with timestamps"""
         url = f"{self.rest_base}/repos/{owner}/{repo}/stargazers?page={page}&per_page={per_page}"
-        response = self._make_request(url)
+        # Star media type adds the starred_at timestamp to each stargazer
+        response = self._make_request(url, accept="application/vnd.github.star+json")
         
         if response:
-            return response.json()
+            return self._parse(response)
         return None
     
     def get_contributors_count(self, owner: str, repo: str) -> int:
@@ -306,37 +476,35 @@ class GitHubClient:
         if response and 'Link' in response.headers:
             # Parse the Link header to get total pages
             links = response.headers['Link']
-            if 'last' in links:
-                import re
-                match = re.search(r'page=(\d+)>; rel="last"', links)
+            if _LINK_LAST_TOKEN in links:
+                match = _LAST_PAGE_RE.search(links)
                 if match:
                     return int(match.group(1))
         
         # If no pagination, count the response
         if response:
-            contributors = response.json()
+            contributors = self._parse(response)
             return len(contributors) if contributors else 0
         return 0
     
-    def get_pulls_count(self, owner: str, repo: str) -> int:
-        """Get total number of pull requests (all states)"""
+    def get_pulls_count(self, owner: str, repo: str) -> Optional[int]:
+        """Get total number of pull requests (all states), or None if the request failed"""
         url = f"{self.rest_base}/repos/{owner}/{repo}/pulls?state=all&per_page=1"
         response = self._make_request(url)
         
         if response and 'Link' in response.headers:
             # Parse the Link header to get total count from last page
             links = response.headers['Link']
-            if 'last' in links:
-                import re
-                match = re.search(r'page=(\d+)>; rel="last"', links)
+            if _LINK_LAST_TOKEN in links:
+                match = _LAST_PAGE_RE.search(links)
                 if match:
                     return int(match.group(1))
         
         # If no pagination, return 1 if we got a response
         if response:
-            pulls = response.json()
+            pulls = self._parse(response)
             return len(pulls) if pulls else 0
-        return 0
+        return None
     
     def get_commits_count(self, owner: str, repo: str) -> int:
         """Get total number of commits in the repository"""
@@ -346,42 +514,40 @@ class GitHubClient:
         if response and 'Link' in response.headers:
             # Parse the Link header to get total count
             links = response.headers['Link']
-            if 'last' in links:
-                import re
-                match = re.search(r'page=(\d+)>; rel="last"', links)
+            if _LINK_LAST_TOKEN in links:
+                match = _LAST_PAGE_RE.search(links)
                 if match:
                     return int(match.group(1))
         
         # If no pagination, try to get count from first page
         if response:
-            commits = response.json()
+            commits = self._parse(response)
             return len(commits) if commits else 0
         return 0
     
-    def get_issues_count(self, owner: str, repo: str) -> int:
+    def get_issues_count(self, owner: str, repo: str, total_prs: int) -> int:
         """Get total number of issues (excluding pull requests)"""
-        url = f"{self.rest_base}/repos/{owner}/{repo}/issues?state=all&per_page=100"
+        # The issues endpoint lists issues and pull requests together, so the
+        # total item count minus the (already fetched) PR count is the issue count
+        url = f"{self.rest_base}/repos/{owner}/{repo}/issues?state=all&per_page=1"
         response = self._make_request(url)
         
         if not response:
             return 0
         
-        issues = response.json()
-        # Filter out pull requests (GitHub API includes PRs in issues endpoint)
-        count = sum(1 for issue in issues if 'pull_request' not in issue)
-        
-        # If there are more pages, we need to paginate
-        if 'Link' in response.headers and 'last' in response.headers['Link']:
-            import re
-            links = response.headers['Link']
-            match = re.search(r'page=(\d+)>; rel="last"', links)
+        total_items = None
+        links = response.headers.get('Link', '')
+        if _LINK_LAST_TOKEN in links:
+            match = _LAST_PAGE_RE.search(links)
             if match:
-                total_pages = int(match.group(1))
-                # Rough estimate: count from first page * total pages
-                # This is an approximation since we're filtering out PRs
-                count = count * total_pages
+                total_items = int(match.group(1))
         
-        return count
+        # If no pagination, count the response
+        if total_items is None:
+            items = self._parse(response)
+            total_items = len(items) if items else 0
+        
+        return max(total_items - total_prs, 0)
 
 # ============================================================================
 # REPOSITORY HISTORY PROCESSING
@@ -389,7 +555,8 @@ class GitHubClient:
 
 def get_star_history_snapshot(
     repo_data: Dict,
-    github_client: GitHubClient
+    github_client: GitHubClient,
+    snapshot_date: str
 ) -> Optional[StarHistoryRecord]:
     """Get current repository metrics snapshot"""
     
@@ -413,8 +580,6 @@ def get_star_history_snapshot(
         total_stars = repo_info.get('stargazers_count', 0)
         total_forks = repo_info.get('forks_count', 0)
         
-        snapshot_date = datetime.now().strftime('%Y-%m-%d')
-        
         # Get additional metrics - total counts
         logger.debug(f"  Fetching total contributors count...")
         total_contributors = github_client.get_contributors_count(owner, name)
@@ -425,8 +590,16 @@ def get_star_history_snapshot(
         logger.debug(f"  Fetching total commits count...")
         total_commits = github_client.get_commits_count(owner, name)
         
-        logger.debug(f"  Fetching total issues count...")
-        total_issues = github_client.get_issues_count(owner, name)
+        # Issues are derived by subtracting PRs, so without a PR count both are unknown;
+        # repos with issues disabled need no issues request at all
+        if total_prs is None:
+            logger.warning(f"⚠️ PR count unavailable for {owner}/{name}, skipping issue count")
+            total_prs = total_issues = 0
+        elif repo_info.get('has_issues', True):
+            logger.debug(f"  Fetching total issues count...")
+            total_issues = github_client.get_issues_count(owner, name, total_prs)
+        else:
+            total_issues = 0
         
         record = StarHistoryRecord(
             repo_owner=owner,
@@ -464,10 +637,27 @@ def load_repositories() -> List[Dict]:
     seen_repos = set()
     
     try:
-        with open(INPUT_CSV, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(INPUT_CSV, 'r', buffering=CSV_READ_BUFFER, encoding='utf-8', newline='') as f:
+            # Plain rows indexed by header position, no per-row dict
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                logger.warning(f"⚠ {INPUT_CSV} is empty")
+                return repos
+            
+            columns = {name: i for i, name in enumerate(header)}
+            i_owner = columns['repo_owner']
+            i_name = columns['repo_name']
+            i_url = columns['repo_url']
+            i_deepseek = columns.get('deepseek_affiliation')
+            i_chatgpt = columns.get('chatgpt_affiliation')
+            
             for row in reader:
-                repo_key = f"{row['repo_owner']}/{row['repo_name']}"
+                if not row:
+                    continue
+                
+                # Tuple of the row's own strings, no per-row key formatting
+                repo_key = (row[i_owner], row[i_name])
                 
                 # Skip duplicates
                 if repo_key in seen_repos:
@@ -475,27 +665,20 @@ def load_repositories() -> List[Dict]:
                 seen_repos.add(repo_key)
                 
                 # Get affiliations
-                deepseek_aff = row.get('deepseek_affiliation', 'none').strip().lower()
-                chatgpt_aff = row.get('chatgpt_affiliation', 'none').strip().lower()
+                deepseek_aff = row[i_deepseek].strip().lower() if i_deepseek is not None else 'none'
+                chatgpt_aff = row[i_chatgpt].strip().lower() if i_chatgpt is not None else 'none'
                 
                 # Filter based on configuration
-                if FILTER_BY_AFFILIATION:
-                    if deepseek_aff != 'none' or chatgpt_aff != 'none':
-                        repos.append({
-                            'repo_owner': row['repo_owner'],
-                            'repo_name': row['repo_name'],
-                            'repo_url': row['repo_url'],
-                            'deepseek_affiliation': deepseek_aff,
-                            'chatgpt_affiliation': chatgpt_aff
-                        })
-                else:
-                    repos.append({
-                        'repo_owner': row['repo_owner'],
-                        'repo_name': row['repo_name'],
-                        'repo_url': row['repo_url'],
-                        'deepseek_affiliation': deepseek_aff,
-                        'chatgpt_affiliation': chatgpt_aff
-                    })
+                if FILTER_BY_AFFILIATION and deepseek_aff == 'none' and chatgpt_aff == 'none':
+                    continue
+                
+                repos.append({
+                    'repo_owner': repo_key[0],
+                    'repo_name': repo_key[1],
+                    'repo_url': row[i_url],
+                    'deepseek_affiliation': deepseek_aff,
+                    'chatgpt_affiliation': chatgpt_aff
+                })
         
         filter_mode = "with affiliation only" if FILTER_BY_AFFILIATION else "all repos"
         logger.info(f"✓ Loaded {len(repos)} unique repositories ({filter_mode})")
@@ -506,242 +689,266 @@ def load_repositories() -> List[Dict]:
         logger.error(f"❌ Failed to load CSV: {e}")
         raise
 
-def save_results(results: List[StarHistoryRecord]):
-    """Save repository snapshots to temporary CSV for growth calculation"""
-    os.makedirs('results', exist_ok=True)
+def save_results_parquet(results: List[StarHistoryRecord]):
+    """Save repository snapshots to a columnar Parquet file"""
+    if pa is None:
+        logger.info("ℹ️ pyarrow not installed, skipping Parquet export")
+        return
     
     if not results:
-        logger.warning("⚠ No results to save")
         return
     
-    logger.info(f"💾 Saving {len(results)} snapshots to temporary storage...")
-    
-    # Check if file exists to determine if we need to write headers
-    file_exists = os.path.exists(TEMP_SNAPSHOT_CSV)
+    os.makedirs('results', exist_ok=True)
+    logger.info(f"💾 Saving {len(results)} snapshots to {SNAPSHOT_PARQUET}...")
     
     try:
-        # Always append to temp file (it's cleaned at program start)
-        with open(TEMP_SNAPSHOT_CSV, 'a' if file_exists else 'w', newline='', encoding='utf-8') as f:
-            fieldnames = [
-                'repo_owner', 'repo_name', 'repo_url', 'snapshot_date',
-                'total_stars', 'total_forks', 'total_contributors',
-                'total_prs', 'total_commits', 'total_issues',
-                'deepseek_affiliation', 'chatgpt_affiliation'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            # Write header only if file doesn't exist yet
-            if not file_exists:
-                writer.writeheader()
-            
-            for result in results:
-                writer.writerow(asdict(result))
-        
-        mode = "appended to" if file_exists else "created"
-        logger.info(f"✓ Snapshots {mode} temporary storage")
+        # Build the table column by column instead of one dict per row
+        columns = {
+            name: [getattr(result, name) for result in results]
+            for name in SNAPSHOT_FIELDS
+        }
+        pq.write_table(pa.table(columns), SNAPSHOT_PARQUET, compression='zstd')
+        logger.info(f"✓ Snapshots saved to {SNAPSHOT_PARQUET}")
         
     except Exception as e:
-        logger.error(f"❌ Failed to save snapshots: {e}")
-        raise
+        logger.error(f"❌ Failed to save Parquet snapshots: {e}")
 
-def calculate_weekly_growth(csv_path: str = TEMP_SNAPSHOT_CSV) -> List[GrowthRecord]:
-    """Calculate week-by-week growth from historical snapshot data"""
-    
-    if not os.path.exists(csv_path):
-        logger.warning(f"⚠️ No historical data found at {csv_path}")
-        return []
+def read_snapshots(csv_path: str) -> Iterator[StarHistoryRecord]:
+    """Read repository snapshots back from a snapshot CSV"""
+    with open(csv_path, 'r', buffering=CSV_READ_BUFFER, encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        
+        columns = {name: i for i, name in enumerate(header)}
+        i_owner, i_name, i_url, i_date = (columns[name] for name in SNAPSHOT_FIELDS[:4])
+        i_stars, i_forks, i_contributors, i_prs, i_commits, i_issues = (
+            columns[name] for name in SNAPSHOT_FIELDS[4:10]
+        )
+        i_deepseek = columns.get('deepseek_affiliation')
+        i_chatgpt = columns.get('chatgpt_affiliation')
+        
+        for row in reader:
+            if not row:
+                continue
+            yield StarHistoryRecord(
+                repo_owner=row[i_owner],
+                repo_name=row[i_name],
+                repo_url=row[i_url],
+                snapshot_date=row[i_date],
+                total_stars=int(row[i_stars]),
+                total_forks=int(row[i_forks]),
+                total_contributors=int(row[i_contributors]),
+                total_prs=int(row[i_prs]),
+                total_commits=int(row[i_commits]),
+                total_issues=int(row[i_issues]),
+                deepseek_affiliation=row[i_deepseek] if i_deepseek is not None else 'none',
+                chatgpt_affiliation=row[i_chatgpt] if i_chatgpt is not None else 'none'
+            )
+
+def calculate_weekly_growth(
+    snapshots: Optional[Iterable[StarHistoryRecord]] = None,
+    csv_path: Optional[str] = None
+) -> Iterator[GrowthRecord]:
+    """Calculate week-by-week growth from snapshot data (yields one record per period)
+    
+    Uses the given in-memory snapshots, or reads them from csv_path if none are passed.
+    """
+    
+    if snapshots is None:
+        if not csv_path or not os.path.exists(csv_path):
+            logger.warning(f"⚠️ No historical data found at {csv_path}")
+            return
+        # A snapshot CSV carries no ordering guarantee, so order it by repo and date first
+        snapshots = sorted(
+            read_snapshots(csv_path),
+            key=attrgetter('repo_owner', 'repo_name', 'snapshot_date')
+        )
     
     logger.info("📊 Calculating week-by-week growth from historical data...")
     
-    # Load all historical snapshots
-    snapshots_by_repo = {}
+    # Diff each snapshot against the previous one for its repo as rows stream in;
+    # only the latest snapshot per repo is kept (in-memory results arrive in date order)
+    prev_by_repo = {}
+    growth_count = 0
+    out_of_order = 0
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                repo_key = f"{row['repo_owner']}/{row['repo_name']}"
-                
-                if repo_key not in snapshots_by_repo:
-                    snapshots_by_repo[repo_key] = []
-                
-                snapshots_by_repo[repo_key].append({
-                    'repo_owner': row['repo_owner'],
-                    'repo_name': row['repo_name'],
-                    'repo_url': row['repo_url'],
-                    'snapshot_date': row['snapshot_date'],
-                    'total_stars': int(row['total_stars']),
-                    'total_forks': int(row['total_forks']),
-                    'total_contributors': int(row['total_contributors']),
-                    'total_prs': int(row['total_prs']),
-                    'total_commits': int(row['total_commits']),
-                    'total_issues': int(row['total_issues']),
-                    'deepseek_affiliation': row.get('deepseek_affiliation', 'none'),
-                    'chatgpt_affiliation': row.get('chatgpt_affiliation', 'none')
-                })
-        
-        logger.info(f"✓ Loaded snapshots for {len(snapshots_by_repo)} repositories")
-        
-        # Calculate growth for each repository
-        growth_records = []
-        
-        for repo_key, snapshots in snapshots_by_repo.items():
-            # Sort snapshots by date
-            snapshots.sort(key=lambda x: x['snapshot_date'])
+        for curr in snapshots:
+            repo_key = (curr.repo_owner, curr.repo_name)
+            prev = prev_by_repo.get(repo_key)
             
-            # Calculate growth between consecutive snapshots
-            for i in range(len(snapshots) - 1):
-                prev = snapshots[i]
-                curr = snapshots[i + 1]
+            if prev is not None:
+                if curr.snapshot_date < prev.snapshot_date:
+                    out_of_order += 1
+                    logger.debug(f"Skipping out-of-order snapshot {curr.repo_owner}/{curr.repo_name} @ {curr.snapshot_date}")
+                    continue
                 
-                growth = GrowthRecord(
-                    repo_owner=curr['repo_owner'],
-                    repo_name=curr['repo_name'],
-                    repo_url=curr['repo_url'],
-                    week_start_date=prev['snapshot_date'],
-                    week_end_date=curr['snapshot_date'],
-                    stars_start=prev['total_stars'],
-                    stars_end=curr['total_stars'],
-                    stars_gained=curr['total_stars'] - prev['total_stars'],
-                    forks_start=prev['total_forks'],
-                    forks_end=curr['total_forks'],
-                    forks_gained=curr['total_forks'] - prev['total_forks'],
-                    contributors_start=prev['total_contributors'],
-                    contributors_end=curr['total_contributors'],
-                    contributors_gained=curr['total_contributors'] - prev['total_contributors'],
-                    prs_start=prev['total_prs'],
-                    prs_end=curr['total_prs'],
-                    prs_created=curr['total_prs'] - prev['total_prs'],
-                    commits_start=prev['total_commits'],
-                    commits_end=curr['total_commits'],
-                    commits_added=curr['total_commits'] - prev['total_commits'],
-                    issues_start=prev['total_issues'],
-                    issues_end=curr['total_issues'],
-                    issues_created=curr['total_issues'] - prev['total_issues'],
-                    deepseek_affiliation=curr['deepseek_affiliation'],
-                    chatgpt_affiliation=curr['chatgpt_affiliation']
+                growth_count += 1
+                yield GrowthRecord(
+                    repo_owner=curr.repo_owner,
+                    repo_name=curr.repo_name,
+                    repo_url=curr.repo_url,
+                    week_start_date=prev.snapshot_date,
+                    week_end_date=curr.snapshot_date,
+                    stars_start=prev.total_stars,
+                    stars_end=curr.total_stars,
+                    stars_gained=curr.total_stars - prev.total_stars,
+                    forks_start=prev.total_forks,
+                    forks_end=curr.total_forks,
+                    forks_gained=curr.total_forks - prev.total_forks,
+                    contributors_start=prev.total_contributors,
+                    contributors_end=curr.total_contributors,
+                    contributors_gained=curr.total_contributors - prev.total_contributors,
+                    prs_start=prev.total_prs,
+                    prs_end=curr.total_prs,
+                    prs_created=curr.total_prs - prev.total_prs,
+                    commits_start=prev.total_commits,
+                    commits_end=curr.total_commits,
+                    commits_added=curr.total_commits - prev.total_commits,
+                    issues_start=prev.total_issues,
+                    issues_end=curr.total_issues,
+                    issues_created=curr.total_issues - prev.total_issues,
+                    deepseek_affiliation=curr.deepseek_affiliation,
+                    chatgpt_affiliation=curr.chatgpt_affiliation
                 )
-                
-                growth_records.append(growth)
+            
+            prev_by_repo[repo_key] = curr
         
-        logger.info(f"✓ Calculated {len(growth_records)} growth periods")
-        return growth_records
+        logger.info(f"✓ Processed snapshots for {len(prev_by_repo)} repositories")
+        if out_of_order:
+            logger.warning(f"⚠️ Skipped {out_of_order} out-of-order snapshots")
+        logger.info(f"✓ Calculated {growth_count} growth periods")
         
     except Exception as e:
+        # Re-raise so a stream cut short is never saved as a complete analysis
         logger.error(f"❌ Failed to calculate growth: {e}")
         logger.debug(traceback.format_exc())
-        return []
+        raise
 
-def save_growth_analysis(growth_records: List[GrowthRecord]):
-    """Save growth analysis to CSV"""
+def save_growth_analysis(growth_records: Iterable[GrowthRecord]) -> Optional[GrowthSummary]:
+    """Stream growth analysis to CSV, summarising the records for the report as they are written"""
     
-    if not growth_records:
+    growth_records = iter(growth_records)
+    first_record = next(growth_records, None)
+    if first_record is None:
         logger.warning("⚠️ No growth data to save")
-        return
+        return None
     
     os.makedirs('results', exist_ok=True)
-    logger.info(f"💾 Saving {len(growth_records)} growth records to {OUTPUT_CSV}...")
+    logger.info(f"💾 Saving growth records to {OUTPUT_CSV}...")
+    summary = GrowthSummary()
     
     try:
         with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = [
-                'repo_owner', 'repo_name', 'repo_url',
-                'week_start_date', 'week_end_date',
-                'stars_start', 'stars_end', 'stars_gained',
-                'forks_start', 'forks_end', 'forks_gained',
-                'contributors_start', 'contributors_end', 'contributors_gained',
-                'prs_start', 'prs_end', 'prs_created',
-                'commits_start', 'commits_end', 'commits_added',
-                'issues_start', 'issues_end', 'issues_created',
-                'deepseek_affiliation', 'chatgpt_affiliation'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(f)
+            writer.writerow(GROWTH_FIELDS)
             
-            for record in growth_records:
-                writer.writerow(asdict(record))
+            # Plain tuples in field order, no per-row dict conversion; only the
+            # running summary is kept, not the records themselves
+            for record in chain((first_record,), growth_records):
+                writer.writerow(_growth_row(record))
+                summary.add(record)
         
-        logger.info(f"✓ Growth analysis saved to {OUTPUT_CSV}")
+        logger.info(f"✓ Growth analysis ({summary.period_count} records) saved to {OUTPUT_CSV}")
+        return summary
         
     except Exception as e:
         logger.error(f"❌ Failed to save growth analysis: {e}")
+        # Don't leave a truncated CSV behind that looks like a finished analysis
+        if os.path.exists(OUTPUT_CSV):
+            os.remove(OUTPUT_CSV)
         raise
 
-def generate_growth_report(growth_records: List[GrowthRecord]) -> str:
+def generate_growth_report(summary: Optional[GrowthSummary]) -> str:
     """Generate week-by-week growth analysis report"""
     
-    if not growth_records:
+    if not summary:
         return ""
     
-    report_lines = []
-    report_lines.append("\n" + "=" * 80)
-    report_lines.append("📈 WEEK-BY-WEEK GROWTH ANALYSIS")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Total Growth Periods Analyzed: {len(growth_records)}")
-    report_lines.append(f"Repositories Tracked: {len(set(f'{r.repo_owner}/{r.repo_name}' for r in growth_records))}")
-    report_lines.append("")
-    
-    # Aggregate growth statistics
-    total_stars_gained = sum(r.stars_gained for r in growth_records)
-    total_forks_gained = sum(r.forks_gained for r in growth_records)
-    total_contributors_gained = sum(r.contributors_gained for r in growth_records)
-    total_prs_created = sum(r.prs_created for r in growth_records)
-    total_commits_added = sum(r.commits_added for r in growth_records)
-    total_issues_created = sum(r.issues_created for r in growth_records)
-    
-    report_lines.append("📊 AGGREGATE GROWTH ACROSS ALL PERIODS")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Total Stars Gained: {total_stars_gained:,}")
-    report_lines.append(f"Total Forks Gained: {total_forks_gained:,}")
-    report_lines.append(f"Total Contributors Gained: {total_contributors_gained:,}")
-    report_lines.append(f"Total PRs Created: {total_prs_created:,}")
-    report_lines.append(f"Total Commits Added: {total_commits_added:,}")
-    report_lines.append(f"Total Issues Created: {total_issues_created:,}")
-    report_lines.append("")
+    report_lines = [
+        "\n" + "=" * 80,
+        "📈 WEEK-BY-WEEK GROWTH ANALYSIS",
+        "=" * 80,
+        f"Total Growth Periods Analyzed: {summary.period_count}",
+        f"Repositories Tracked: {len(summary.tracked_repos)}",
+        ""
+    ]
+    
+    report_lines.extend((
+        "📊 AGGREGATE GROWTH ACROSS ALL PERIODS",
+        "-" * 80,
+        f"Total Stars Gained: {summary.total_stars_gained:,}",
+        f"Total Forks Gained: {summary.total_forks_gained:,}",
+        f"Total Contributors Gained: {summary.total_contributors_gained:,}",
+        f"Total PRs Created: {summary.total_prs_created:,}",
+        f"Total Commits Added: {summary.total_commits_added:,}",
+        f"Total Issues Created: {summary.total_issues_created:,}",
+        ""
+    ))
     
     # Top growing repositories by stars
-    report_lines.append("⭐ TOP 10 FASTEST GROWING (STARS PER PERIOD)")
-    report_lines.append("-" * 80)
-    top_star_growth = sorted(growth_records, key=lambda r: r.stars_gained, reverse=True)[:10]
+    report_lines.extend((
+        "⭐ TOP 10 FASTEST GROWING (STARS PER PERIOD)",
+        "-" * 80
+    ))
+    top_star_growth = summary.ranked(summary.top_stars)
     for idx, record in enumerate(top_star_growth, 1):
-        report_lines.append(f"{idx}. {record.repo_owner}/{record.repo_name}")
-        report_lines.append(f"   Period: {record.week_start_date} → {record.week_end_date}")
-        report_lines.append(f"   Stars: {record.stars_start:,} → {record.stars_end:,} (+{record.stars_gained:,})")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {record.repo_owner}/{record.repo_name}",
+            f"   Period: {record.week_start_date} → {record.week_end_date}",
+            f"   Stars: {record.stars_start:,} → {record.stars_end:,} (+{record.stars_gained:,})",
+            ""
+        ))
     
     # Top growing by commits
-    report_lines.append("💻 TOP 10 MOST ACTIVE DEVELOPMENT (COMMITS PER PERIOD)")
-    report_lines.append("-" * 80)
-    top_commit_growth = sorted(growth_records, key=lambda r: r.commits_added, reverse=True)[:10]
+    report_lines.extend((
+        "💻 TOP 10 MOST ACTIVE DEVELOPMENT (COMMITS PER PERIOD)",
+        "-" * 80
+    ))
+    top_commit_growth = summary.ranked(summary.top_commits)
     for idx, record in enumerate(top_commit_growth, 1):
-        report_lines.append(f"{idx}. {record.repo_owner}/{record.repo_name}")
-        report_lines.append(f"   Period: {record.week_start_date} → {record.week_end_date}")
-        report_lines.append(f"   Commits: {record.commits_start:,} → {record.commits_end:,} (+{record.commits_added:,})")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {record.repo_owner}/{record.repo_name}",
+            f"   Period: {record.week_start_date} → {record.week_end_date}",
+            f"   Commits: {record.commits_start:,} → {record.commits_end:,} (+{record.commits_added:,})",
+            ""
+        ))
     
     # Top growing by PRs
-    report_lines.append("📥 TOP 10 MOST PULL REQUESTS (PRS PER PERIOD)")
-    report_lines.append("-" * 80)
-    top_pr_growth = sorted(growth_records, key=lambda r: r.prs_created, reverse=True)[:10]
+    report_lines.extend((
+        "📥 TOP 10 MOST PULL REQUESTS (PRS PER PERIOD)",
+        "-" * 80
+    ))
+    top_pr_growth = summary.ranked(summary.top_prs)
     for idx, record in enumerate(top_pr_growth, 1):
-        report_lines.append(f"{idx}. {record.repo_owner}/{record.repo_name}")
-        report_lines.append(f"   Period: {record.week_start_date} → {record.week_end_date}")
-        report_lines.append(f"   PRs: {record.prs_start:,} → {record.prs_end:,} (+{record.prs_created:,})")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {record.repo_owner}/{record.repo_name}",
+            f"   Period: {record.week_start_date} → {record.week_end_date}",
+            f"   PRs: {record.prs_start:,} → {record.prs_end:,} (+{record.prs_created:,})",
+            ""
+        ))
     
     # Top growing by issues
-    report_lines.append("🐛 TOP 10 MOST ISSUES CREATED (ISSUES PER PERIOD)")
-    report_lines.append("-" * 80)
-    top_issue_growth = sorted(growth_records, key=lambda r: r.issues_created, reverse=True)[:10]
+    report_lines.extend((
+        "🐛 TOP 10 MOST ISSUES CREATED (ISSUES PER PERIOD)",
+        "-" * 80
+    ))
+    top_issue_growth = summary.ranked(summary.top_issues)
     for idx, record in enumerate(top_issue_growth, 1):
-        report_lines.append(f"{idx}. {record.repo_owner}/{record.repo_name}")
-        report_lines.append(f"   Period: {record.week_start_date} → {record.week_end_date}")
-        report_lines.append(f"   Issues: {record.issues_start:,} → {record.issues_end:,} (+{record.issues_created:,})")
-        report_lines.append("")
-    
-    report_lines.append("=" * 80)
-    report_lines.append(f"📁 Growth data saved to: {OUTPUT_CSV}")
-    report_lines.append("=" * 80)
+        report_lines.extend((
+            f"{idx}. {record.repo_owner}/{record.repo_name}",
+            f"   Period: {record.week_start_date} → {record.week_end_date}",
+            f"   Issues: {record.issues_start:,} → {record.issues_end:,} (+{record.issues_created:,})",
+            ""
+        ))
+    
+    report_lines.extend((
+        "=" * 80,
+        f"📁 Growth data saved to: {OUTPUT_CSV}",
+        "=" * 80
+    ))
     
     return "\n".join(report_lines)
 
@@ -751,31 +958,40 @@ def generate_report(results: List[StarHistoryRecord], duration, stats: Dict) ->
     if not results:
         return "No data to report"
     
-    report_lines = []
-    report_lines.append("=" * 80)
-    report_lines.append("📊 GITHUB REPOSITORY HISTORY SCRAPING REPORT")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append(f"Scraping Frequency: {SCRAPING_FREQUENCY.upper()}")
-    report_lines.append(f"Filter Mode: {'Affiliated Only' if FILTER_BY_AFFILIATION else 'All Repositories'}")
-    report_lines.append("")
+    report_lines = [
+        "=" * 80,
+        "📊 GITHUB REPOSITORY HISTORY SCRAPING REPORT",
+        "=" * 80,
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Scraping Frequency: {SCRAPING_FREQUENCY.upper()}",
+        f"Filter Mode: {'Affiliated Only' if FILTER_BY_AFFILIATION else 'All Repositories'}",
+        ""
+    ]
     
     # Summary Statistics
-    report_lines.append("📊 SUMMARY STATISTICS")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Total Repositories Scraped: {len(results)}")
-    report_lines.append(f"Scraping Duration: {duration}")
-    report_lines.append(f"Total API Requests: {stats['total_requests']:,}")
-    report_lines.append(f"Tokens Used: {stats['total_tokens']}")
-    report_lines.append("")
-    
-    # Repository Metrics
-    total_stars = sum(r.total_stars for r in results)
-    total_forks = sum(r.total_forks for r in results)
-    total_contributors = sum(r.total_contributors for r in results)
-    total_prs = sum(r.total_prs for r in results)
-    total_commits = sum(r.total_commits for r in results)
-    total_issues = sum(r.total_issues for r in results)
+    report_lines.extend((
+        "📊 SUMMARY STATISTICS",
+        "-" * 80,
+        f"Total Repositories Scraped: {len(results)}",
+        f"Scraping Duration: {duration}",
+        f"Total API Requests: {stats['total_requests']:,}",
+        f"Tokens Used: {stats['total_tokens']}",
+        ""
+    ))
+    
+    # Repository Metrics and affiliation counts (single pass over results)
+    total_stars = total_forks = total_contributors = 0
+    total_prs = total_commits = total_issues = 0
+    deepseek_count = chatgpt_count = 0
+    for r in results:
+        total_stars += r.total_stars
+        total_forks += r.total_forks
+        total_contributors += r.total_contributors
+        total_prs += r.total_prs
+        total_commits += r.total_commits
+        total_issues += r.total_issues
+        deepseek_count += r.has_deepseek_affiliation
+        chatgpt_count += r.has_chatgpt_affiliation
     
     avg_stars = total_stars / len(results) if results else 0
     avg_forks = total_forks / len(results) if results else 0
@@ -784,98 +1000,126 @@ def generate_report(results: List[StarHistoryRecord], duration, stats: Dict) ->
     avg_commits = total_commits / len(results) if results else 0
     avg_issues = total_issues / len(results) if results else 0
     
-    report_lines.append("📈 REPOSITORY METRICS (TOTAL COUNTS)")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Total Stars Across All Repos: {total_stars:,} (avg: {avg_stars:,.0f})")
-    report_lines.append(f"Total Forks Across All Repos: {total_forks:,} (avg: {avg_forks:,.0f})")
-    report_lines.append(f"Total Contributors: {total_contributors:,} (avg: {avg_contributors:,.0f})")
-    report_lines.append(f"Total Pull Requests: {total_prs:,} (avg: {avg_prs:,.0f})")
-    report_lines.append(f"Total Commits: {total_commits:,} (avg: {avg_commits:,.0f})")
-    report_lines.append(f"Total Issues: {total_issues:,} (avg: {avg_issues:,.0f})")
-    report_lines.append("")
+    report_lines.extend((
+        "📈 REPOSITORY METRICS (TOTAL COUNTS)",
+        "-" * 80,
+        f"Total Stars Across All Repos: {total_stars:,} (avg: {avg_stars:,.0f})",
+        f"Total Forks Across All Repos: {total_forks:,} (avg: {avg_forks:,.0f})",
+        f"Total Contributors: {total_contributors:,} (avg: {avg_contributors:,.0f})",
+        f"Total Pull Requests: {total_prs:,} (avg: {avg_prs:,.0f})",
+        f"Total Commits: {total_commits:,} (avg: {avg_commits:,.0f})",
+        f"Total Issues: {total_issues:,} (avg: {avg_issues:,.0f})",
+        ""
+    ))
     
     # Top 5 Most Starred Repositories
-    report_lines.append("🏆 TOP 5 MOST STARRED REPOSITORIES")
-    report_lines.append("-" * 80)
-    top_starred = sorted(results, key=lambda r: r.total_stars, reverse=True)[:5]
+    report_lines.extend((
+        "🏆 TOP 5 MOST STARRED REPOSITORIES",
+        "-" * 80
+    ))
+    top_starred = heapq.nlargest(5, results, key=attrgetter('total_stars'))
     for idx, repo in enumerate(top_starred, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   Stars: {repo.total_stars:,} | Forks: {repo.total_forks:,} | Contributors: {repo.total_contributors:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   Stars: {repo.total_stars:,} | Forks: {repo.total_forks:,} | Contributors: {repo.total_contributors:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Top 5 Most Active Repositories (by total commits)
-    report_lines.append("🔥 TOP 5 MOST ACTIVE REPOSITORIES (TOTAL COMMITS)")
-    report_lines.append("-" * 80)
-    top_active = sorted(results, key=lambda r: r.total_commits, reverse=True)[:5]
+    report_lines.extend((
+        "🔥 TOP 5 MOST ACTIVE REPOSITORIES (TOTAL COMMITS)",
+        "-" * 80
+    ))
+    top_active = heapq.nlargest(5, results, key=attrgetter('total_commits'))
     for idx, repo in enumerate(top_active, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   Commits: {repo.total_commits:,} | PRs: {repo.total_prs:,} | Issues: {repo.total_issues:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   Commits: {repo.total_commits:,} | PRs: {repo.total_prs:,} | Issues: {repo.total_issues:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Top 5 Most Collaborative (by contributors)
-    report_lines.append("👥 TOP 5 MOST COLLABORATIVE REPOSITORIES")
-    report_lines.append("-" * 80)
-    top_collab = sorted(results, key=lambda r: r.total_contributors, reverse=True)[:5]
+    report_lines.extend((
+        "👥 TOP 5 MOST COLLABORATIVE REPOSITORIES",
+        "-" * 80
+    ))
+    top_collab = heapq.nlargest(5, results, key=attrgetter('total_contributors'))
     for idx, repo in enumerate(top_collab, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   Contributors: {repo.total_contributors:,} | Stars: {repo.total_stars:,} | Commits: {repo.total_commits:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   Contributors: {repo.total_contributors:,} | Stars: {repo.total_stars:,} | Commits: {repo.total_commits:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Top 5 by Pull Requests
-    report_lines.append("📥 TOP 5 REPOSITORIES BY TOTAL PULL REQUESTS")
-    report_lines.append("-" * 80)
-    top_prs_repos = sorted(results, key=lambda r: r.total_prs, reverse=True)[:5]
+    report_lines.extend((
+        "📥 TOP 5 REPOSITORIES BY TOTAL PULL REQUESTS",
+        "-" * 80
+    ))
+    top_prs_repos = heapq.nlargest(5, results, key=attrgetter('total_prs'))
     for idx, repo in enumerate(top_prs_repos, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   PRs: {repo.total_prs:,} | Commits: {repo.total_commits:,} | Stars: {repo.total_stars:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   PRs: {repo.total_prs:,} | Commits: {repo.total_commits:,} | Stars: {repo.total_stars:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Top 5 by Issues
-    report_lines.append("🐛 TOP 5 REPOSITORIES BY TOTAL ISSUES")
-    report_lines.append("-" * 80)
-    top_issues_repos = sorted(results, key=lambda r: r.total_issues, reverse=True)[:5]
+    report_lines.extend((
+        "🐛 TOP 5 REPOSITORIES BY TOTAL ISSUES",
+        "-" * 80
+    ))
+    top_issues_repos = heapq.nlargest(5, results, key=attrgetter('total_issues'))
     for idx, repo in enumerate(top_issues_repos, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   Issues: {repo.total_issues:,} | Stars: {repo.total_stars:,} | Contributors: {repo.total_contributors:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   Issues: {repo.total_issues:,} | Stars: {repo.total_stars:,} | Contributors: {repo.total_contributors:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Top 5 Most Forked
-    report_lines.append("🍴 TOP 5 MOST FORKED REPOSITORIES")
-    report_lines.append("-" * 80)
-    top_forked = sorted(results, key=lambda r: r.total_forks, reverse=True)[:5]
+    report_lines.extend((
+        "🍴 TOP 5 MOST FORKED REPOSITORIES",
+        "-" * 80
+    ))
+    top_forked = heapq.nlargest(5, results, key=attrgetter('total_forks'))
     for idx, repo in enumerate(top_forked, 1):
-        report_lines.append(f"{idx}. {repo.repo_owner}/{repo.repo_name}")
-        report_lines.append(f"   Forks: {repo.total_forks:,} | Stars: {repo.total_stars:,} | Contributors: {repo.total_contributors:,}")
-        report_lines.append(f"   URL: {repo.repo_url}")
-        report_lines.append("")
+        report_lines.extend((
+            f"{idx}. {repo.repo_owner}/{repo.repo_name}",
+            f"   Forks: {repo.total_forks:,} | Stars: {repo.total_stars:,} | Contributors: {repo.total_contributors:,}",
+            f"   URL: {repo.repo_url}",
+            ""
+        ))
     
     # Affiliation Breakdown
-    deepseek_count = sum(1 for r in results if r.deepseek_affiliation.lower() != 'none')
-    chatgpt_count = sum(1 for r in results if r.chatgpt_affiliation.lower() != 'none')
-    
-    report_lines.append("🏢 AFFILIATION BREAKDOWN")
-    report_lines.append("-" * 80)
-    report_lines.append(f"DeepSeek Affiliated: {deepseek_count} ({deepseek_count/len(results)*100:.1f}%)")
-    report_lines.append(f"ChatGPT Affiliated: {chatgpt_count} ({chatgpt_count/len(results)*100:.1f}%)")
-    report_lines.append("")
+    report_lines.extend((
+        "🏢 AFFILIATION BREAKDOWN",
+        "-" * 80,
+        f"DeepSeek Affiliated: {deepseek_count} ({deepseek_count/len(results)*100:.1f}%)",
+        f"ChatGPT Affiliated: {chatgpt_count} ({chatgpt_count/len(results)*100:.1f}%)",
+        ""
+    ))
     
     # File Locations
-    report_lines.append("📁 OUTPUT FILES")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Growth CSV: {OUTPUT_CSV}")
-    report_lines.append(f"Temp Snapshots: {TEMP_SNAPSHOT_CSV}")
-    report_lines.append(f"Log File: {LOG_FILE}")
-    report_lines.append(f"Report File: {REPORT_FILE}")
-    report_lines.append("")
-    
-    report_lines.append("=" * 80)
-    report_lines.append("✅ END OF REPORT")
-    report_lines.append("=" * 80)
+    report_lines.extend((
+        "📁 OUTPUT FILES",
+        "-" * 80,
+        f"Growth CSV: {OUTPUT_CSV}",
+        f"Log File: {LOG_FILE}",
+        f"Report File: {REPORT_FILE}",
+        ""
+    ))
+    
+    report_lines.extend((
+        "=" * 80,
+        "✅ END OF REPORT",
+        "=" * 80
+    ))
     
     return "\n".join(report_lines)
 
@@ -889,6 +1133,20 @@ def save_report(report_text: str):
     except Exception as e:
         logger.error(f"❌ Failed to save report: {e}")
 
+# Report lines worth forwarding to Discord, matched in a single scan per line
+_DISCORD_SUMMARY_RE = re.compile('|'.join(map(re.escape, (
+    "Total Repositories Scraped:",
+    "Scraping Duration:",
+    "Total Stars Across All Repos:",
+    "Average Stars Per Repo:",
+    "New Pull Requests",
+    "New Commits",
+    "New Issues",
+))))
+
+# Reused for webhook posts so repeated notifications share one keep-alive connection
+_discord_session = requests.Session()
+
 def send_discord_notification(report_summary: str):
     """Send summary report to Discord webhook"""
     if not DISCORD_WEBHOOK_URL:
@@ -899,21 +1157,14 @@ def send_discord_notification(report_summary: str):
         # Create a shorter summary for Discord (2000 char limit)
         lines = report_summary.split('\n')
         
-        # Extract key statistics
-        discord_message = "📊 **GitHub Repository History Scraping Complete!**\n\n"
+        # Extract key statistics (find them in the report)
+        key_lines = [line.strip() for line in lines if _DISCORD_SUMMARY_RE.search(line)]
         
-        # Add key metrics (find them in the report)
-        for line in lines:
-            if "Total Repositories Scraped:" in line or \
-               "Scraping Duration:" in line or \
-               "Total Stars Across All Repos:" in line or \
-               "Average Stars Per Repo:" in line or \
-               "New Pull Requests" in line or \
-               "New Commits" in line or \
-               "New Issues" in line:
-                discord_message += f"{line.strip()}\n"
-        
-        discord_message += f"\n📄 Full report saved to: `{REPORT_FILE}`"
+        discord_message = (
+            "📊 **GitHub Repository History Scraping Complete!**\n\n"
+            + "".join(f"{line}\n" for line in key_lines)
+            + f"\n📄 Full report saved to: `{REPORT_FILE}`"
+        )
         
         # Send to Discord
         payload = {
@@ -921,7 +1172,15 @@ def send_discord_notification(report_summary: str):
             "username": "Repository History Bot"
         }
         
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
+        if orjson is not None:
+            response = _discord_session.post(
+                DISCORD_WEBHOOK_URL,
+                data=orjson.dumps(payload),
+                headers={'Content-Type': 'application/json'},
+                timeout=10
+            )
+        else:
+            response = _discord_session.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
         
         if response.status_code == 204:
             logger.info("✓ Discord notification sent successfully")
@@ -940,14 +1199,6 @@ def main():
     logger.info(f"Scraping Frequency: {SCRAPING_FREQUENCY.upper()}")
     logger.info(f"Filter Mode: {'Affiliated Only' if FILTER_BY_AFFILIATION else 'All Repositories'}")
     
-    # Clean up temporary snapshot file from previous runs
-    if os.path.exists(TEMP_SNAPSHOT_CSV):
-        try:
-            os.remove(TEMP_SNAPSHOT_CSV)
-            logger.info(f"🗑️  Removed previous temporary snapshot file")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not remove temp file: {e}")
-    
     # Initialize components
     token_manager = TokenManager()
     github_client = GitHubClient(token_manager)
@@ -962,48 +1213,63 @@ def main():
     filter_status = "with affiliation only" if FILTER_BY_AFFILIATION else "all repos"
     logger.info(f"🎯 Processing {len(repositories)} repositories ({filter_status}) with {MAX_WORKERS} workers")
     
+    # All snapshots from this run share the same date
+    snapshot_date = start_time.strftime('%Y-%m-%d')
+    
     # Process repositories with threading
     all_results = []
     processed_count = 0
     error_count = 0
     
-    logger.info(f"⚡ Starting ThreadPoolExecutor with {min(MAX_WORKERS, len(token_manager.tokens))} workers...")
+    num_workers = min(MAX_WORKERS, len(token_manager.tokens))
+    logger.info(f"⚡ Starting ThreadPoolExecutor with {num_workers} workers...")
     
-    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(token_manager.tokens))) as executor:
-        # Submit all tasks
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # Submit a bounded window of tasks, refilled as tasks complete
+        pending_repos = iter(repositories)
         future_to_repo = {
-            executor.submit(get_star_history_snapshot, repo, github_client): repo
-            for repo in repositories
+            executor.submit(get_star_history_snapshot, repo, github_client, snapshot_date): repo
+            for repo in islice(pending_repos, num_workers * TASKS_PER_WORKER)
         }
         
         # Process completed tasks
-        for future in as_completed(future_to_repo):
-            repo = future_to_repo[future]
-            processed_count += 1
+        while future_to_repo:
+            done, _ = wait(future_to_repo, return_when=FIRST_COMPLETED)
             
-            try:
-                result = future.result()
-                if result:
-                    all_results.append(result)
+            for future in done:
+                repo = future_to_repo.pop(future)
+                processed_count += 1
                 
-                # Log progress every 10 repositories
-                if processed_count % 10 == 0:
-                    progress = (processed_count / len(repositories)) * 100
-                    stats = token_manager.get_stats()
+                next_repo = next(pending_repos, None)
+                if next_repo is not None:
+                    future_to_repo[executor.submit(get_star_history_snapshot, next_repo, github_client, snapshot_date)] = next_repo
+                
+                try:
+                    result = future.result()
+                    if result:
+                        all_results.append(result)
                     
-                    logger.info(f"📊 Progress: {processed_count}/{len(repositories)} ({progress:.1f}%) - "
-                              f"Found: {len(all_results)} records - "
-                              f"Errors: {error_count} - "
-                              f"API requests: {stats['total_requests']}")
+                    # Log progress every 10 repositories
+                    if processed_count % 10 == 0:
+                        progress = (processed_count / len(repositories)) * 100
+                        stats = token_manager.get_stats()
+                        
+                        logger.info(f"📊 Progress: {processed_count}/{len(repositories)} ({progress:.1f}%) - "
+                                  f"Found: {len(all_results)} records - "
+                                  f"Errors: {error_count} - "
+                                  f"API requests: {stats['total_requests']}")
                 
-            except Exception as e:
-                error_count += 1
-                logger.error(f"❌ Error processing {repo['repo_owner']}/{repo['repo_name']}: {str(e)[:150]}")
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"❌ Error processing {repo['repo_owner']}/{repo['repo_name']}: {str(e)[:150]}")
     
     logger.info(f"✓ ThreadPoolExecutor completed all tasks")
     
-    # Save results
-    save_results(all_results)
+    if not all_results:
+        logger.warning("⚠ No results to save")
+    
+    if SAVE_PARQUET:
+        save_results_parquet(all_results)
     
     # Final statistics
     end_time = datetime.now()
@@ -1029,12 +1295,12 @@ def main():
     
     # Print summary to console
     if all_results:
-        total_stars = sum(r.total_stars for r in all_results)
-        total_forks = sum(r.total_forks for r in all_results)
-        total_commits = sum(r.total_commits for r in all_results)
+        total_stars = sum(map(attrgetter('total_stars'), all_results))
+        total_forks = sum(map(attrgetter('total_forks'), all_results))
+        total_commits = sum(map(attrgetter('total_commits'), all_results))
         avg_stars = total_stars / len(all_results)
-        max_stars_repo = max(all_results, key=lambda r: r.total_stars)
-        max_commits_repo = max(all_results, key=lambda r: r.total_commits)
+        max_stars_repo = max(all_results, key=attrgetter('total_stars'))
+        max_commits_repo = max(all_results, key=attrgetter('total_commits'))
         
         logger.info(f"\n📊 Repository Statistics:")
         logger.info(f"   Total stars across all repos: {total_stars:,}")
@@ -1051,11 +1317,12 @@ def main():
     # Calculate and save week-by-week growth analysis
     if CALCULATE_GROWTH:
         logger.info("\n📈 Analyzing week-by-week growth trends...")
-        growth_records = calculate_weekly_growth()
+        # Growth periods are written to CSV as they are calculated from this
+        # run's in-memory snapshots
+        growth_summary = save_growth_analysis(calculate_weekly_growth(all_results))
         
-        if growth_records:
-            save_growth_analysis(growth_records)
-            growth_report = generate_growth_report(growth_records)
+        if growth_summary:
+            growth_report = generate_growth_report(growth_summary)
             print(growth_report)
             
             # Append growth analysis to main report
@@ -1069,14 +1336,6 @@ def main():
         else:
             logger.info("ℹ️ Not enough historical data for growth analysis (need at least 2 snapshots per repo)")
     
-    # Clean up temporary snapshot file after processing
-    if os.path.exists(TEMP_SNAPSHOT_CSV):
-        try:
-            os.remove(TEMP_SNAPSHOT_CSV)
-            logger.info(f"🗑️  Removed temporary snapshot file")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not remove temp file: {e}")
-    
     logger.info(f"\n✅ All tasks completed! Report saved to: {REPORT_FILE}")
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Growth Calculation Ordering
+Verifies that week-by-week growth from a snapshot CSV does not depend on row order
+"""
+
+import os
+import sys
+import csv
+import random
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repoHistory import SNAPSHOT_FIELDS, calculate_weekly_growth
+
+def make_snapshot_rows():
+    """Build snapshot rows for a few repos over several weeks, in date order"""
+    rows = []
+    for owner, name in [("alice", "alpha"), ("bob", "beta"), ("carol", "gamma")]:
+        for week, date in enumerate(["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-22"]):
+            rows.append([
+                owner, name, f"https://github.com/{owner}/{name}", date,
+                100 + week * 10, 10 + week, 5 + week,
+                20 + week * 2, 300 + week * 7, 40 + week * 3,
+                "none", "openai"
+            ])
+    return rows
+
+def write_snapshot_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(SNAPSHOT_FIELDS)
+        writer.writerows(rows)
+
+def test_shuffled_csv_matches_sorted():
+    """A shuffled snapshot CSV must yield the same growth rows as the sorted one"""
+    rows = make_snapshot_rows()
+    shuffled = rows[:]
+    random.Random(42).shuffle(shuffled)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sorted_csv = os.path.join(tmp_dir, "sorted.csv")
+        shuffled_csv = os.path.join(tmp_dir, "shuffled.csv")
+        write_snapshot_csv(sorted_csv, rows)
+        write_snapshot_csv(shuffled_csv, shuffled)
+
+        sorted_growth = list(calculate_weekly_growth(csv_path=sorted_csv))
+        shuffled_growth = list(calculate_weekly_growth(csv_path=shuffled_csv))
+
+    print(f"✓ Sorted CSV: {len(sorted_growth)} growth periods")
+    print(f"✓ Shuffled CSV: {len(shuffled_growth)} growth periods")
+
+    # 3 repos x 4 snapshots -> 3 periods each
+    assert len(sorted_growth) == 9
+    assert shuffled_growth == sorted_growth
+    assert all(g.stars_gained == 10 for g in shuffled_growth)
+
+if __name__ == "__main__":
+    test_shuffled_csv_matches_sorted()
+    print("✅ Growth is independent of snapshot row order")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Request Retry Behavior
+Verifies that rate-limited (429) and rejected-token (401) responses rotate to the next token
+"""
+
+import os
+import sys
+from unittest.mock import patch
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repoHistory import GitHubClient, TokenManager
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter that answers with a fixed sequence of status codes"""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.tokens_used = []
+
+    def send(self, request, **kwargs):
+        self.tokens_used.append(request.headers['Authorization'])
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.headers = CaseInsensitiveDict()
+        response._content = b'{}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+def fetch_with_statuses(statuses):
+    """Make one request through a stubbed client; returns (response, tokens used)"""
+    with patch.object(TokenManager, '_load_tokens', return_value=['TOKEN_1', 'TOKEN_2']):
+        client = GitHubClient(TokenManager())
+    adapter = StubAdapter(statuses)
+    client.session.mount('https://', adapter)
+
+    with patch('repoHistory.time.sleep'):
+        response = client._make_request("https://api.github.com/repos/octo/demo")
+    return response, adapter.tokens_used
+
+def test_429_rotates_token():
+    """A 429 without Retry-After must be retried on the next token"""
+    response, tokens_used = fetch_with_statuses([429, 200])
+    print(f"✓ 429 -> tokens used: {tokens_used}")
+
+    assert response is not None and response.status_code == 200
+    assert tokens_used == ['Bearer TOKEN_1', 'Bearer TOKEN_2']
+
+def test_401_rotates_token():
+    """A 401 from one revoked token must not fail the request"""
+    response, tokens_used = fetch_with_statuses([401, 200])
+    print(f"✓ 401 -> tokens used: {tokens_used}")
+
+    assert response is not None and response.status_code == 200
+    assert tokens_used == ['Bearer TOKEN_1', 'Bearer TOKEN_2']
+
+def test_422_is_terminal():
+    """Other 4xx responses are returned as failures without retrying"""
+    response, tokens_used = fetch_with_statuses([422, 200])
+    print(f"✓ 422 -> tokens used: {tokens_used}")
+
+    assert response is None
+    assert len(tokens_used) == 1
+
+if __name__ == "__main__":
+    test_429_rotates_token()
+    test_401_rotates_token()
+    test_422_is_terminal()
+    print("✅ Token rotation on 401/429 works")
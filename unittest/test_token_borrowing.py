@@ -4,141 +4,249 @@ Test Token Borrowing Feature
 Demonstrates how workers can borrow unused tokens when their assigned token hits rate limit
 """
 
+import io
 import os
+import sys
+import time
+import heapq
+from array import array
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+import pytest
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+
+RESET_NS = 3600 * 1_000_000_000  # Simulated rate limit window (1 hour)
+_EXHAUSTED_ROW = "   Token #%d: ✗ Exhausted | Remaining: %d | Requests: %d | Reset: %s"
 
 # Simulate the TokenManager class
 class MockTokenManager:
     """Simulated TokenManager to demonstrate token borrowing"""
     
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        "tokens", "token_index", "remaining", "requests", "reset_time",
+        "_full_mask", "available_mask", "reset_heap",
+    )
+    
     def __init__(self, num_tokens=20):
         load_dotenv()
         self.tokens = [f"TOKEN_{i}" for i in range(1, num_tokens + 1)]
-        self.token_stats = {
-            token: {
-                "remaining": 5000,
-                "reset_time": None,
-                "requests": 0
-            } for token in self.tokens
-        }
-        print(f"✓ Initialized with {len(self.tokens)} tokens")
-    
-    def _is_token_available(self, token: str) -> bool:
-        """Check if a token has available rate limit"""
-        stats = self.token_stats[token]
+        self.token_index = {token: idx for idx, token in enumerate(self.tokens)}
         
-        if stats["reset_time"] is None or datetime.now() >= stats["reset_time"]:
-            return stats["remaining"] > 10
+        # Per-token stats as parallel arrays (index i belongs to self.tokens[i]);
+        # remaining is a packed C int array so reductions over it run in C
+        self.remaining = array('i', [5000]) * num_tokens
+        self.requests = [0] * num_tokens
+        self.reset_time = [None] * num_tokens  # time.monotonic_ns() deadline
         
-        return stats["remaining"] > 10
+        # Bit i set = token i is available; exhausted tokens wait in a heap by reset time
+        self._full_mask = (1 << num_tokens) - 1
+        self.available_mask = self._full_mask
+        self.reset_heap = []
+        print(f"✓ Initialized with {len(self.tokens)} tokens")
+    
+    def _release_expired(self, now_ns: int):
+        """Return tokens whose reset time has passed to the available set"""
+        while self.reset_heap and self.reset_heap[0][0] <= now_ns:
+            _, idx = heapq.heappop(self.reset_heap)
+            self.remaining[idx] = 5000
+            self.reset_time[idx] = None
+            self.available_mask |= 1 << idx
+    
+    def all_tokens_exhausted(self) -> bool:
+        """Check if all tokens are exhausted"""
+        self._release_expired(time.monotonic_ns())
+        return not self.available_mask
     
     def get_token(self) -> str:
         """Get next available token with borrowing"""
-        # Simulate finding an available token
-        for token in self.tokens:
-            if self._is_token_available(token):
-                self.token_stats[token]["requests"] += 1
-                return token
+        self._release_expired(time.monotonic_ns())
+        
+        # Lowest set bit = first available token
+        mask = self.available_mask
+        if mask:
+            idx = (mask & -mask).bit_length() - 1
+            self.requests[idx] += 1
+            return self.tokens[idx]
         
         # All exhausted
         return self.tokens[0]
     
     def simulate_usage(self, token: str, requests: int):
         """Simulate token usage"""
-        self.token_stats[token]["remaining"] -= requests
-        self.token_stats[token]["requests"] += requests
+        idx = self.token_index[token]
+        self.remaining[idx] -= requests
+        self.requests[idx] += requests
         
-        if self.token_stats[token]["remaining"] <= 10:
+        if self.remaining[idx] <= 10 and self.available_mask >> idx & 1:
             # Simulate reset time 1 hour from now
-            self.token_stats[token]["reset_time"] = datetime.now() + timedelta(hours=1)
+            self.reset_time[idx] = time.monotonic_ns() + RESET_NS
+            self.available_mask &= ~(1 << idx)
+            heapq.heappush(self.reset_heap, (self.reset_time[idx], idx))
+    
+    def run_worker_batch(self, num_requests: int, cost: int):
+        """Simulate num_requests get_token + simulate_usage calls in bulk
+        
+        Tokens are drained lowest index first, exactly as repeated get_token calls
+        would, but each token's share is computed arithmetically. Returns the
+        (token index, request count) spans that served the batch.
+        """
+        self._release_expired(time.monotonic_ns())
+        spans = []
+        
+        while num_requests and self.available_mask:
+            mask = self.available_mask
+            idx = (mask & -mask).bit_length() - 1
+            
+            # Requests this token serves before dropping to the exhaustion threshold
+            served = min(num_requests, -(-(self.remaining[idx] - 10) // cost))
+            self.remaining[idx] -= served * cost
+            self.requests[idx] += served * (cost + 1)  # get_token counts 1 per request
+            num_requests -= served
+            spans.append((idx, served))
+            
+            if self.remaining[idx] <= 10:
+                self.reset_time[idx] = time.monotonic_ns() + RESET_NS
+                self.available_mask &= ~(1 << idx)
+                heapq.heappush(self.reset_heap, (self.reset_time[idx], idx))
+        
+        if num_requests:
+            # All exhausted: get_token falls back to the first token
+            self.remaining[0] -= num_requests * cost
+            self.requests[0] += num_requests * cost
+            spans.append((0, num_requests))
+        
+        return spans
+    
+    def bulk_simulate_usage(self, indices, cost: int):
+        """Simulate the same usage on several tokens at once"""
+        reset_ns = time.monotonic_ns() + RESET_NS
+        for idx in indices:
+            self.remaining[idx] -= cost
+            self.requests[idx] += cost
+            
+            if self.remaining[idx] <= 10 and self.available_mask >> idx & 1:
+                self.reset_time[idx] = reset_ns
+                self.available_mask &= ~(1 << idx)
+                self.reset_heap.append((reset_ns, idx))
+        
+        heapq.heapify(self.reset_heap)
+    
+    @staticmethod
+    def _format_reset(reset_ns: int, now_ns: int) -> str:
+        """Time left until a monotonic reset deadline, as +Xm Ys"""
+        minutes, rest_ns = divmod(max(reset_ns - now_ns, 0), 60_000_000_000)
+        return "+%dm %02ds" % (minutes, rest_ns // 1_000_000_000)
     
     def show_stats(self):
         """Display token statistics"""
-        available = sum(1 for t in self.tokens if self._is_token_available(t))
+        now_ns = time.monotonic_ns()
+        self._release_expired(now_ns)
+        # Expired resets were just released, so the mask alone gives the count
+        available = self.available_mask.bit_count()
         exhausted = len(self.tokens) - available
         
         print(f"\n📊 Token Statistics:")
         print(f"   Available: {available}/{len(self.tokens)}")
         print(f"   Exhausted: {exhausted}/{len(self.tokens)}")
-        print(f"\n   Detailed breakdown:")
         
-        for idx, token in enumerate(self.tokens[:10], 1):  # Show first 10
-            stats = self.token_stats[token]
-            status = "✓ Available" if self._is_token_available(token) else "✗ Exhausted"
-            reset = stats["reset_time"].strftime("%H:%M:%S") if stats["reset_time"] else "N/A"
-            print(f"   Token #{idx}: {status} | Remaining: {stats['remaining']} | "
-                  f"Requests: {stats['requests']} | Reset: {reset}")
+        # Uniform pools get a one-line summary instead of per-token rows
+        if self.available_mask == self._full_mask:
+            print(f"\n   All {len(self.tokens)} tokens available")
+            return
+        if not self.available_mask:
+            print(f"\n   All {len(self.tokens)} tokens exhausted | "
+                  f"Next reset: {self._format_reset(self.reset_heap[0][0], now_ns)}")
+            return
         
-        if len(self.tokens) > 10:
-            print(f"   ... and {len(self.tokens) - 10} more tokens")
+        print(f"\n   Exhausted tokens:")
+        
+        # Walk only the cleared bits, lowest index first
+        exhausted_bits = self.available_mask ^ self._full_mask
+        rows = []
+        while exhausted_bits and len(rows) < 10:  # Show first 10
+            idx = (exhausted_bits & -exhausted_bits).bit_length() - 1
+            exhausted_bits &= exhausted_bits - 1
+            rows.append(_EXHAUSTED_ROW % (
+                idx + 1, self.remaining[idx], self.requests[idx],
+                self._format_reset(self.reset_time[idx], now_ns)
+            ))
+        sys.stdout.write("\n".join(rows) + "\n")
+        
+        shown = len(rows)
+        if exhausted > shown:
+            print(f"   ... and {exhausted - shown} more exhausted tokens")
+
+REQUESTS_PER_WORKER = 15
+REQUEST_COST = 50  # Rate limit consumed by each simulated request
 
-def test_scenario_1():
+@pytest.mark.parametrize("num_workers,num_tokens", [(5, 20), (15, 20), (20, 20)])
+def test_scenario_1(num_workers, num_tokens):
     """
-    Scenario 1: 5 workers, 20 tokens
+    Scenario 1: N workers, 20 tokens
     Workers can easily borrow from the pool of 20 tokens
     """
     print("\n" + "="*70)
-    print("SCENARIO 1: 5 Workers, 20 Tokens (Easy Borrowing)")
+    print(f"SCENARIO 1: {num_workers} Workers, {num_tokens} Tokens (Easy Borrowing)")
     print("="*70)
     
-    manager = MockTokenManager(num_tokens=20)
-    num_workers = 5
+    manager = MockTokenManager(num_tokens=num_tokens)
     
     print(f"\nSimulating {num_workers} workers making requests...")
     
-    # Simulate 5 workers making many requests
+    # Simulate workers making many requests
     for worker_id in range(1, num_workers + 1):
         print(f"\n👷 Worker #{worker_id}:")
         
         # Each worker makes 15 requests
-        for request_num in range(1, 16):
-            token = manager.get_token()
-            manager.simulate_usage(token, 50)  # Each request costs ~50 rate limit
-            
-            if request_num % 5 == 0:
-                print(f"   ✓ Completed {request_num} requests")
+        manager.run_worker_batch(REQUESTS_PER_WORKER, REQUEST_COST)
+        for request_num in range(5, REQUESTS_PER_WORKER + 1, 5):
+            print(f"   ✓ Completed {request_num} requests")
         
         # Show which tokens this worker used
-        token_usage = {t: s["requests"] for t, s in manager.token_stats.items() if s["requests"] > 0}
+        token_usage = [t for t, count in zip(manager.tokens, manager.requests) if count > 0]
         print(f"   Total unique tokens used: {len(token_usage)}")
     
     manager.show_stats()
     
+    # Every request is billed (1 for get_token + the simulated cost) and the pool never runs dry
+    assert sum(manager.requests) == num_workers * REQUESTS_PER_WORKER * (REQUEST_COST + 1)
+    assert manager.available_mask != 0
+    
     print("\n💡 Observation:")
-    print("   With 5 workers and 20 tokens, workers can freely borrow")
+    print(f"   With {num_workers} workers and {num_tokens} tokens, workers can freely borrow")
     print("   from the large pool. Even if some tokens hit rate limits,")
     print("   many fresh tokens are available for borrowing.")
 
-def test_scenario_2():
+@pytest.mark.parametrize("num_workers,num_tokens,num_exhausted", [(15, 20, 10)])
+def test_scenario_2(num_workers, num_tokens, num_exhausted):
     """
     Scenario 2: 15 workers, 20 tokens
     Some workers will need to borrow from others
     """
     print("\n" + "="*70)
-    print("SCENARIO 2: 15 Workers, 20 Tokens (Moderate Borrowing)")
+    print(f"SCENARIO 2: {num_workers} Workers, {num_tokens} Tokens (Moderate Borrowing)")
     print("="*70)
     
-    manager = MockTokenManager(num_tokens=20)
-    num_workers = 15
+    manager = MockTokenManager(num_tokens=num_tokens)
     
     print(f"\nSimulating {num_workers} workers making requests...")
     
-    # Exhaust first 10 tokens heavily
-    print("\nPhase 1: First 10 workers exhaust their primary tokens...")
-    for worker_id in range(1, 11):
-        primary_token = manager.tokens[worker_id - 1]
-        manager.simulate_usage(primary_token, 4990)  # Almost exhaust
-        print(f"   Worker #{worker_id} exhausted {primary_token}")
+    # Exhaust first tokens heavily
+    print(f"\nPhase 1: First {num_exhausted} workers exhaust their primary tokens...")
+    manager.bulk_simulate_usage(range(num_exhausted), 4990)  # Almost exhaust
+    for worker_id in range(1, num_exhausted + 1):
+        print(f"   Worker #{worker_id} exhausted {manager.tokens[worker_id - 1]}")
     
     manager.show_stats()
     
     # Now these workers need to borrow
-    print("\nPhase 2: Exhausted workers borrow from remaining 10 tokens...")
-    for worker_id in range(1, 11):
+    print(f"\nPhase 2: Exhausted workers borrow from remaining {num_tokens - num_exhausted} tokens...")
+    for worker_id in range(1, num_exhausted + 1):
         token = manager.get_token()  # Will borrow from pool
-        token_id = manager.tokens.index(token) + 1
+        token_id = manager.token_index[token] + 1
         print(f"   Worker #{worker_id} borrowed Token #{token_id}")
+        assert token_id > num_exhausted
     
     manager.show_stats()
     
@@ -147,7 +255,8 @@ def test_scenario_2():
     print("   borrow from the pool of available tokens. The system")
     print("   maximizes throughput by utilizing all available tokens.")
 
-def test_scenario_3():
+@pytest.mark.parametrize("num_tokens", [20])
+def test_scenario_3(num_tokens):
     """
     Scenario 3: All tokens exhausted
     Shows what happens when all tokens hit rate limit
@@ -156,25 +265,34 @@ def test_scenario_3():
     print("SCENARIO 3: All Tokens Exhausted (Rate Limit Hit)")
     print("="*70)
     
-    manager = MockTokenManager(num_tokens=20)
+    manager = MockTokenManager(num_tokens=num_tokens)
     
-    print("\nExhausting all 20 tokens...")
-    for idx, token in enumerate(manager.tokens, 1):
-        manager.simulate_usage(token, 4990)
-        if idx % 5 == 0:
-            print(f"   Exhausted {idx}/20 tokens...")
+    print(f"\nExhausting all {num_tokens} tokens...")
+    manager.bulk_simulate_usage(range(len(manager.tokens)), 4990)
+    for idx in range(5, len(manager.tokens) + 1, 5):
+        print(f"   Exhausted {idx}/{num_tokens} tokens...")
     
     manager.show_stats()
+    assert manager.all_tokens_exhausted()
+    assert max(manager.remaining) <= 10
     
     print("\n⚠️ Attempting to get a token when all are exhausted...")
     token = manager.get_token()
     print(f"   Returned: {token} (falls back to first token)")
+    assert token == manager.tokens[0]
     print(f"   This will trigger the 1-hour sleep mechanism in the real scraper")
     
     print("\n💡 Observation:")
     print("   When all tokens are exhausted, the system falls back gracefully")
     print("   and triggers the batch sleep mechanism (1 hour wait).")
 
+def capture_output(scenario, *args) -> str:
+    """Run a scenario and return everything it printed"""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        scenario(*args)
+    return buf.getvalue()
+
 def main():
     print("\n" + "="*70)
     print("Token Borrowing Feature Demonstration")
@@ -187,9 +305,18 @@ def main():
     print("  ✓ Automatically finds available tokens")
     print("  ✓ Gracefully handles full exhaustion")
     
-    test_scenario_1()
-    test_scenario_2()
-    test_scenario_3()
+    # Scenarios share no state, so run them in separate processes and
+    # print each one's captured output in order
+    scenarios = [
+        (test_scenario_1, 5, 20),
+        (test_scenario_2, 15, 20, 10),
+        (test_scenario_3, 20),
+    ]
+    with ProcessPoolExecutor(max_workers=len(scenarios)) as executor:
+        futures = [executor.submit(capture_output, *scenario) for scenario in scenarios]
+        for future in futures:
+            sys.stdout.write(future.result())
+    sys.stdout.flush()
     
     print("\n" + "="*70)
     print("Summary")